@@ -5,11 +5,19 @@ Provides authentication, database utilities, and common models
 for all club apps (coin-club, care-club, career-club, campfire-club).
 """
 
+from .utils.lazy import lazy_exports
+
 __version__ = "0.1.0"
 
-from .auth.jwt_handler import create_access_token, verify_token
-from .auth.dependencies import get_current_user_id
-from .database.connection import get_common_db, get_app_db
+# Public names are imported on first access (PEP 562), so importing the
+# package doesn't pull in the JWT, FastAPI and SQLAlchemy stacks up front.
+_LAZY_IMPORTS = {
+    "create_access_token": ".auth.jwt_handler",
+    "verify_token": ".auth.jwt_handler",
+    "get_current_user_id": ".auth.dependencies",
+    "get_common_db": ".database.connection",
+    "get_app_db": ".database.connection",
+}
 
 __all__ = [
     "create_access_token",
@@ -18,3 +26,5 @@ __all__ = [
     "get_common_db",
     "get_app_db",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS)
@@ -5,9 +5,21 @@ Provides JWT token handling, password hashing, and FastAPI dependencies
 for user authentication.
 """
 
-from .jwt_handler import create_access_token, verify_token, get_user_id_from_token
-from .password import hash_password, verify_password
-from .dependencies import get_current_user_id, get_current_user_email
+from ..utils.lazy import lazy_exports
+
+# Imported on first access (PEP 562) so token helpers don't load FastAPI
+_LAZY_IMPORTS = {
+    "create_access_token": ".jwt_handler",
+    "verify_token": ".jwt_handler",
+    "get_user_id_from_token": ".jwt_handler",
+    "hash_password": ".password",
+    "verify_password": ".password",
+    "get_token_payload": ".dependencies",
+    "get_current_user_id": ".dependencies",
+    "get_current_user_email": ".dependencies",
+    "get_current_user": ".dependencies",
+    "invalidate_cached_user": ".dependencies",
+}
 
 __all__ = [
     "create_access_token",
@@ -15,6 +27,11 @@ __all__ = [
     "get_user_id_from_token",
     "hash_password",
     "verify_password",
+    "get_token_payload",
     "get_current_user_id",
     "get_current_user_email",
+    "get_current_user",
+    "invalidate_cached_user",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS)
@@ -5,17 +5,101 @@ Provides dependency injection for FastAPI routes to extract and verify
 authenticated users from JWT tokens.
 """
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPBearer
+import logging
+import threading
 from .jwt_handler import verify_token
+from ..database.connection import get_common_db
+from ..models.user import User
 
+logger = logging.getLogger(__name__)
 
-# HTTP Bearer token security scheme
+
+# HTTP Bearer token security scheme, kept for apps that depend on it directly
 security = HTTPBearer()
 
+# Loaded User rows keyed by user ID, so warm users skip the SELECT-by-pk
+USER_CACHE_SIZE = 5000
+USER_CACHE_TTL_SECONDS = 60
+_user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+_user_cache_lock = threading.Lock()
+
+
+class _BearerToken(HTTPBearer):
+    """
+    HTTPBearer that returns the raw token string.
+    
+    Being an HTTPBearer keeps the security scheme in the OpenAPI docs of
+    every route using the auth dependencies, while skipping the
+    HTTPAuthorizationCredentials object built on every request.
+    """
+    
+    async def __call__(self, request: Request) -> str:
+        """
+        Extract the bearer token straight from the Authorization header.
+        
+        Raises:
+            HTTPException: 401 if the header is missing, not a Bearer token,
+                or carries an empty token
+        """
+        authorization = request.headers.get("authorization")
+        
+        if not authorization or authorization[:7].lower() != "bearer " or not authorization[7:]:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Not authenticated",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
+        return authorization[7:]
+
+
+# Same scheme name as `security`, so both appear as one scheme in OpenAPI
+_bearer_token = _BearerToken(scheme_name="HTTPBearer")
+
+
+async def get_token_payload(
+    request: Request,
+    token: str = Depends(_bearer_token)
+) -> dict:
+    """
+    FastAPI dependency to verify the JWT token once per request.
+    
+    The decoded payload is stored on ``request.state.jwt_payload`` so that
+    every other auth dependency in the same request reuses it instead of
+    verifying the token again.
+    
+    Args:
+        request: Incoming request (automatically injected by FastAPI)
+        token: Bearer token from the Authorization header
+    
+    Returns:
+        Decoded token payload
+    
+    Raises:
+        HTTPException: 401 if token is invalid or missing
+    """
+    payload = getattr(request.state, "jwt_payload", None)
+    if payload is not None:
+        return payload
+    
+    try:
+        payload = verify_token(token)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    request.state.jwt_payload = payload
+    return payload
+
 
 async def get_current_user_id(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    payload: dict = Depends(get_token_payload)
 ) -> int:
     """
     FastAPI dependency to extract and verify current user ID from JWT token.
@@ -24,7 +108,7 @@ async def get_current_user_id(
     is authenticated and to get their user ID for database queries.
     
     Args:
-        credentials: HTTP Bearer credentials (automatically extracted by FastAPI)
+        payload: Verified token payload (automatically injected by FastAPI)
     
     Returns:
         User ID as integer
@@ -39,27 +123,17 @@ async def get_current_user_id(
         >>> ):
         >>>     return {"user_id": current_user_id}
     """
+    # verify_token already enforced the presence of "sub"
     try:
-        token = credentials.credentials
-        payload = verify_token(token)
-        user_id = int(payload.get("sub"))
-        
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        return user_id
-        
-    except ValueError as e:
+        return int(payload["sub"])
+    except (ValueError, KeyError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=str(e),
+            detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
     except Exception:
+        logger.exception("Unexpected error while reading user ID from token")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -68,13 +142,13 @@ async def get_current_user_id(
 
 
 async def get_current_user_email(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    payload: dict = Depends(get_token_payload)
 ) -> str:
     """
     FastAPI dependency to extract user email from JWT token.
     
     Args:
-        credentials: HTTP Bearer credentials
+        payload: Verified token payload
     
     Returns:
         User email as string
@@ -82,21 +156,78 @@ async def get_current_user_email(
     Raises:
         HTTPException: 401 if token is invalid
     """
-    try:
-        token = credentials.credentials
-        payload = verify_token(token)
-        email = payload.get("email")
-        
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials"
-            )
-        
-        return email
-        
-    except ValueError as e:
+    email = payload.get("email")
+    
+    if email is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=str(e)
+            detail="Invalid authentication credentials"
         )
+    
+    return email
+
+
+def get_current_user(
+    user_id: int = Depends(get_current_user_id),
+    db = Depends(get_common_db)
+) -> User:
+    """
+    FastAPI dependency to load the current user from common-club.db.
+    
+    A plain ``def`` so FastAPI runs the blocking session lookup in its
+    threadpool rather than on the event loop.
+    
+    Loaded users are cached for USER_CACHE_TTL_SECONDS. The returned object is
+    detached from any session and shared between requests, so treat it as
+    read-only and call invalidate_cached_user() after updating a profile.
+    
+    Args:
+        user_id: Current user ID (automatically injected by FastAPI)
+        db: Database session for common-club.db
+    
+    Returns:
+        User model instance
+    
+    Raises:
+        HTTPException: 401 if token is invalid or the user no longer exists
+    
+    Example:
+        >>> @router.get("/me", response_model=UserResponse)
+        >>> async def read_me(current_user: User = Depends(get_current_user)):
+        >>>     return current_user
+    """
+    with _user_cache_lock:
+        user = _user_cache.get(user_id)
+    
+    if user is not None:
+        return user
+    
+    user = db.get(User, user_id)
+    
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    db.expunge(user)
+    
+    with _user_cache_lock:
+        _user_cache[user_id] = user
+    
+    return user
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """
+    Drop a user from the get_current_user cache.
+    
+    Call this from endpoints that update or delete a user so the next
+    request reloads it from the database.
+    
+    Args:
+        user_id: User's database ID
+    """
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
@@ -4,16 +4,39 @@ JWT Token Handler
 Handles creation and verification of JWT tokens for user authentication.
 """
 
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Optional
-from jose import JWTError, jwt
+from cachetools import TTLCache
+import hashlib
+import jwt
 import os
+import threading
+import time
 
 
 # Configuration
-SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-secret-key-change-in-production")
+DEFAULT_SECRET_KEY = "dev-secret-key-change-in-production"
+SECRET_KEY = os.getenv("JWT_SECRET_KEY", DEFAULT_SECRET_KEY)
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_DAYS = 30
+TOKEN_CACHE_SIZE = 10_000
+TOKEN_CACHE_TTL_SECONDS = 30
+
+# The key is encoded once at import, so it can't be swapped at runtime
+if os.getenv("COMMON_CLUB_ENV") == "production" and SECRET_KEY == DEFAULT_SECRET_KEY:
+    raise RuntimeError(
+        "JWT_SECRET_KEY environment variable must be set in production. "
+        "Example: JWT_SECRET_KEY=$(openssl rand -hex 32)"
+    )
+
+_SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8")
+_ALGORITHMS = [ALGORITHM]
+_DEFAULT_DELTA = timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS)
+
+# Cache of verified payloads keyed by a BLAKE2b digest of the token; failed
+# verifications are never cached
+_payload_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL_SECONDS)
+_payload_cache_lock = threading.Lock()
 
 
 def create_access_token(user_id: int, email: str, expires_delta: Optional[timedelta] = None) -> str:
@@ -33,19 +56,18 @@ def create_access_token(user_id: int, email: str, expires_delta: Optional[timede
         >>> print(token)
         'eyJ0eXAiOiJKV1QiLC...'
     """
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS)
+    # Integer epoch seconds are what PyJWT stores anyway
+    now_ts = int(time.time())
+    exp_ts = now_ts + int((expires_delta or _DEFAULT_DELTA).total_seconds())
     
     to_encode = {
         "sub": str(user_id),
         "email": email,
-        "exp": expire,
-        "iat": datetime.utcnow()
+        "exp": exp_ts,
+        "iat": now_ts
     }
     
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY_BYTES, algorithm=ALGORITHM)
     return encoded_jwt
 
 
@@ -67,17 +89,40 @@ def verify_token(token: str) -> dict:
         >>> print(payload)
         {'sub': '1', 'email': 'user@example.com', 'exp': 1234567890}
     """
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        
-        if user_id is None:
-            raise ValueError("Invalid token: missing user ID")
-        
-        return payload
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    
+    with _payload_cache_lock:
+        payload = _payload_cache.get(cache_key)
+    
+    if payload is not None:
+        # Cached entries may outlive the token itself, so re-check expiry.
+        # exp was required when decoding; if it is gone, the shared dict was
+        # mutated, so fail closed rather than never expiring
+        exp = payload.get("exp")
+        if exp is not None and exp > time.time():
+            return payload
         
-    except JWTError as e:
+        with _payload_cache_lock:
+            _payload_cache.pop(cache_key, None)
+        if exp is None:
+            raise ValueError("Invalid token: Token is missing the \"exp\" claim")
+        raise ValueError("Invalid token: Signature has expired")
+    
+    try:
+        # Claim presence is enforced as part of the single verified decode
+        payload = jwt.decode(
+            token,
+            _SECRET_KEY_BYTES,
+            algorithms=_ALGORITHMS,
+            options={"require": ["exp", "sub"]},
+        )
+    except jwt.PyJWTError as e:
         raise ValueError(f"Invalid token: {str(e)}")
+    
+    with _payload_cache_lock:
+        _payload_cache[cache_key] = payload
+    
+    return payload
 
 
 def get_user_id_from_token(token: str) -> int:
@@ -4,11 +4,25 @@ Password Hashing Utilities
 Secure password hashing and verification using bcrypt.
 """
 
-from passlib.context import CryptContext
+from functools import lru_cache
+import os
 
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt work factor (cost is 2**rounds); tests lower it via the env var
+BCRYPT_ROUNDS = int(os.getenv("COMMON_CLUB_BCRYPT_ROUNDS", "12"))
+
+
+@lru_cache(maxsize=None)
+def _get_pwd_context():
+    """
+    Build the password hashing context on first use.
+    
+    Deferring the passlib import keeps it (and bcrypt) off the package
+    import path for code that never touches passwords.
+    """
+    from passlib.context import CryptContext
+    
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 
 def hash_password(password: str) -> str:
@@ -26,7 +40,7 @@ def hash_password(password: str) -> str:
         >>> print(hashed)
         '$2b$12$...'
     """
-    return pwd_context.hash(password)
+    return _get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -47,4 +61,4 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         >>> verify_password("wrong_password", hashed)
         False
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return _get_pwd_context().verify(plain_password, hashed_password)
@@ -4,25 +4,47 @@ Database Package
 Provides database connection and session management utilities.
 """
 
-from .connection import (
-    init_common_db,
-    init_app_db,
-    get_common_db,
-    get_app_db,
-    get_common_engine,
-    get_app_engine
-)
-from .base import Base, create_database_engine, create_session_maker
+from ..utils.lazy import lazy_exports
+
+# Imported on first access (PEP 562)
+_LAZY_IMPORTS = {
+    "init_common_db": ".connection",
+    "init_app_db": ".connection",
+    "get_common_db": ".connection",
+    "get_app_db": ".connection",
+    "common_db_session": ".connection",
+    "app_db_session": ".connection",
+    "get_common_engine": ".connection",
+    "get_app_engine": ".connection",
+    "init_common_async_db": ".connection",
+    "init_app_async_db": ".connection",
+    "get_common_async_db": ".connection",
+    "get_app_async_db": ".connection",
+    "Base": ".base",
+    "create_database_engine": ".base",
+    "create_session_maker": ".base",
+    "create_async_database_engine": ".base",
+    "create_async_session_maker": ".base",
+}
 
 __all__ = [
     "init_common_db",
     "init_app_db",
     "get_common_db",
     "get_app_db",
+    "common_db_session",
+    "app_db_session",
     "get_common_engine",
     "get_app_engine",
+    "init_common_async_db",
+    "init_app_async_db",
+    "get_common_async_db",
+    "get_app_async_db",
     "Base",
     "create_database_engine",
     "create_session_maker",
+    "create_async_database_engine",
+    "create_async_session_maker",
 ]
 
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS)
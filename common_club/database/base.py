@@ -5,22 +5,56 @@ Provides base classes and configuration for SQLAlchemy ORM models.
 """
 
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
-from typing import Generator
+from sqlalchemy.pool import StaticPool
+from typing import AsyncGenerator, Generator
 import os
 
 
 # Declarative base for all models
 Base = declarative_base()
 
+# Connection pool configuration (file databases only)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_POOL_OVERFLOW = int(os.getenv("DB_POOL_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
 
-def get_database_url(db_path: str) -> str:
+# PRAGMAs applied to every new SQLite connection
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=30000000000",
+)
+
+
+def is_memory_database(db_path: str) -> bool:
+    """Check whether a database path refers to an in-memory SQLite database."""
+    if db_path.startswith("file:"):
+        return "mode=memory" in db_path
+    return db_path in ("", ":memory:")
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLITE_PRAGMAS on a freshly opened DBAPI connection."""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def get_database_url(db_path: str, driver: str = "sqlite") -> str:
     """
     Get SQLite database URL from file path.
     
+    SQLite URI filenames (``file:...``) are passed through unchanged, e.g.
+    ``file:test?mode=memory&cache=shared`` for a named in-memory database
+    shared by every connection in the process.
+    
     Args:
-        db_path: Path to SQLite database file
+        db_path: Path to SQLite database file, or a ``file:`` URI
+        driver: SQLAlchemy dialect+driver name (e.g. "sqlite+aiosqlite")
     
     Returns:
         SQLAlchemy database URL
@@ -30,6 +64,15 @@ def get_database_url(db_path: str) -> str:
         >>> print(url)
         'sqlite:///./myapp.db'
     """
+    if db_path.startswith("file:"):
+        # uri=true makes SQLAlchemy open it with sqlite3.connect(uri=True)
+        if "uri=true" not in db_path:
+            db_path += ("&" if "?" in db_path else "?") + "uri=true"
+        return f"{driver}:///{db_path}"
+    
+    if is_memory_database(db_path):
+        return f"{driver}://"
+    
     # Expand user home directory if present
     db_path = os.path.expanduser(db_path)
     
@@ -37,36 +80,92 @@ def get_database_url(db_path: str) -> str:
     if not os.path.isabs(db_path):
         db_path = os.path.abspath(db_path)
     
-    return f"sqlite:///{db_path}"
+    return f"{driver}:///{db_path}"
 
 
-def create_database_engine(db_path: str, **kwargs):
+def _build_engine(
+    create,
+    db_path: str,
+    driver: str,
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_POOL_OVERFLOW,
+    pool_recycle: int = DB_POOL_RECYCLE,
+    pool_use_lifo: bool = True,
+    pool_pre_ping: bool = True,
+    **kwargs
+):
     """
-    Create SQLAlchemy engine for SQLite database.
+    Build a sync or async SQLite engine with the shared pool and PRAGMA setup.
     
-    Args:
-        db_path: Path to SQLite database file
-        **kwargs: Additional engine configuration
+    Holds the one definition of the pool arguments and their defaults for
+    create_database_engine() and create_async_database_engine().
     
-    Returns:
-        SQLAlchemy engine
+    Args:
+        create: ``create_engine`` or ``create_async_engine``
+        db_path: Path to SQLite database file, ``":memory:"`` or a ``file:`` URI
+        driver: SQLAlchemy dialect+driver name
+        (remaining arguments as documented on create_database_engine())
     """
-    database_url = get_database_url(db_path)
+    # An in-memory database only lives as long as its connection, so every
+    # session has to share a single one. File databases keep the default
+    # pool so concurrent sessions don't share a transaction.
+    if is_memory_database(db_path):
+        kwargs.setdefault("poolclass", StaticPool)
+    elif "poolclass" not in kwargs:
+        kwargs.update(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_recycle=pool_recycle,
+            pool_use_lifo=pool_use_lifo,
+            pool_pre_ping=pool_pre_ping,
+        )
     
     # SQLite specific configuration
-    engine = create_engine(
-        database_url,
+    engine = create(
+        get_database_url(db_path, driver=driver),
         connect_args={"check_same_thread": False},  # Needed for SQLite
         **kwargs
     )
     
+    # WAL + synchronous=NORMAL avoids an fsync per commit
+    event.listen(getattr(engine, "sync_engine", engine), "connect", _set_sqlite_pragmas)
+    
     return engine
 
 
+def create_database_engine(db_path: str, **kwargs):
+    """
+    Create SQLAlchemy engine for SQLite database.
+    
+    Every new connection is configured with SQLITE_PRAGMAS. In-memory
+    databases (``":memory:"`` or a ``mode=memory`` URI) use a StaticPool;
+    file databases use a
+    LIFO QueuePool sized by the pool arguments, which default to the
+    DB_POOL_SIZE, DB_POOL_OVERFLOW and DB_POOL_RECYCLE env vars.
+    
+    Args:
+        db_path: Path to SQLite database file, ``":memory:"`` or a ``file:`` URI
+        pool_size: Number of connections kept open in the pool
+        max_overflow: Extra connections allowed beyond pool_size
+        pool_recycle: Seconds after which a connection is replaced
+        pool_use_lifo: Reuse the most recently returned connection first
+        pool_pre_ping: Check connections are alive before handing them out
+        **kwargs: Additional engine configuration
+    
+    Returns:
+        SQLAlchemy engine
+    """
+    return _build_engine(create_engine, db_path, "sqlite", **kwargs)
+
+
 def create_session_maker(engine):
     """
     Create SQLAlchemy session maker.
     
+    Objects are not expired on commit, so a route can commit and then
+    return the object without another SELECT. Objects returned from a
+    request should not be modified after its session is closed.
+    
     Args:
         engine: SQLAlchemy engine
     
@@ -76,6 +175,7 @@ def create_session_maker(engine):
     return sessionmaker(
         autocommit=False,
         autoflush=False,
+        expire_on_commit=False,
         bind=engine
     )
 
@@ -106,3 +206,68 @@ def get_database_session(session_maker) -> Generator:
         yield db
     finally:
         db.close()
+
+
+def create_async_database_engine(db_path: str, **kwargs):
+    """
+    Create SQLAlchemy AsyncEngine for SQLite database using aiosqlite.
+    
+    Takes the same arguments as create_database_engine(), with the same
+    pooling and PRAGMAs. Requires the ``async`` extra
+    (``pip install common-club[async]``).
+    
+    Returns:
+        SQLAlchemy AsyncEngine
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+    
+    return _build_engine(create_async_engine, db_path, "sqlite+aiosqlite", **kwargs)
+
+
+def create_async_session_maker(engine):
+    """
+    Create SQLAlchemy async session maker.
+    
+    Objects are not expired on commit, since an AsyncSession can't
+    lazily reload attributes on access.
+    
+    Args:
+        engine: SQLAlchemy AsyncEngine
+    
+    Returns:
+        Async session maker factory
+    """
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    
+    return async_sessionmaker(
+        autoflush=False,
+        expire_on_commit=False,
+        bind=engine
+    )
+
+
+async def get_async_database_session(session_maker) -> AsyncGenerator:
+    """
+    Get async database session with automatic cleanup.
+    
+    This is an async generator function to be used with FastAPI Depends(),
+    which keeps the dependency on the event loop instead of the threadpool.
+    
+    Args:
+        session_maker: SQLAlchemy async session maker
+    
+    Yields:
+        Async database session
+    
+    Example:
+        >>> AsyncSessionLocal = create_async_session_maker(engine)
+        >>> async def get_db():
+        >>>     async for db in get_async_database_session(AsyncSessionLocal):
+        >>>         yield db
+        >>> 
+        >>> @app.get("/items")
+        >>> async def read_items(db = Depends(get_db)):
+        >>>     return (await db.execute(select(Item))).scalars().all()
+    """
+    async with session_maker() as db:
+        yield db
@@ -4,16 +4,84 @@ Database Connection Utilities
 Provides connection management for common-club.db and app-specific databases.
 """
 
-from typing import Generator
+from contextlib import contextmanager
+from typing import AsyncGenerator, Generator
 import os
-from .base import create_database_engine, create_session_maker, get_database_session
+import threading
+from .base import (
+    create_database_engine,
+    create_session_maker,
+    get_database_session,
+    create_async_database_engine,
+    create_async_session_maker,
+    get_async_database_session,
+)
+
+
+class _DatabaseState:
+    """Engine, session maker and path of one lazily initialized database."""
+    
+    __slots__ = ("engine", "session_maker", "db_path")
+    
+    def __init__(self):
+        self.engine = None
+        self.session_maker = None
+        self.db_path = None
 
 
 # Global engine and session maker instances
-_common_engine = None
-_common_session_maker = None
-_app_engine = None
-_app_session_maker = None
+_common = _DatabaseState()
+_app = _DatabaseState()
+_common_async = _DatabaseState()
+_app_async = _DatabaseState()
+
+# Guards lazy initialization so concurrent first requests create one engine
+_init_lock = threading.Lock()
+
+
+def _resolve_common_db_path(db_path: str = None) -> str:
+    """Fall back to COMMON_DB_PATH or the default common-club.db location."""
+    if db_path is None:
+        db_path = os.getenv("COMMON_DB_PATH", "../common-club/common-club.db")
+    return db_path
+
+
+def _resolve_app_db_path(db_path: str = None) -> str:
+    """Fall back to APP_DB_PATH, which must be set."""
+    if db_path is None:
+        db_path = os.getenv("APP_DB_PATH")
+        if not db_path:
+            raise ValueError(
+                "APP_DB_PATH environment variable must be set. "
+                "Example: APP_DB_PATH=./coin-club.db"
+            )
+    return db_path
+
+
+def _init_engine(db_path: str, engine_factory, session_factory, state: _DatabaseState):
+    """
+    Create the engine and session maker for state, unless already set up for db_path.
+    
+    Shared by the sync and async initializers, so both reuse an existing
+    engine (and its warm connections) when called again with the same path.
+    """
+    if state.engine is not None and db_path == state.db_path:
+        return state.engine
+    
+    state.engine = engine_factory(db_path)
+    state.session_maker = session_factory(state.engine)
+    state.db_path = db_path
+    
+    return state.engine
+
+
+def _ensure_initialized(state: _DatabaseState, init) -> _DatabaseState:
+    """Run init() on first use, so concurrent first requests create one engine."""
+    if state.session_maker is None:
+        with _init_lock:
+            if state.session_maker is None:
+                init()
+    return state
 
 
 def init_common_db(db_path: str = None):
@@ -23,16 +91,12 @@ def init_common_db(db_path: str = None):
     Args:
         db_path: Path to common-club.db file.
                  Defaults to ../common-club/common-club.db or from env COMMON_DB_PATH
-    """
-    global _common_engine, _common_session_maker
-    
-    if db_path is None:
-        db_path = os.getenv("COMMON_DB_PATH", "../common-club/common-club.db")
     
-    _common_engine = create_database_engine(db_path)
-    _common_session_maker = create_session_maker(_common_engine)
-    
-    return _common_engine
+    Calling it again with the same path returns the existing engine.
+    """
+    return _init_engine(
+        _resolve_common_db_path(db_path), create_database_engine, create_session_maker, _common
+    )
 
 
 def init_app_db(db_path: str = None):
@@ -42,21 +106,48 @@ def init_app_db(db_path: str = None):
     Args:
         db_path: Path to app database file.
                  Defaults to from env APP_DB_PATH
+    
+    Calling it again with the same path returns the existing engine.
+    """
+    return _init_engine(
+        _resolve_app_db_path(db_path), create_database_engine, create_session_maker, _app
+    )
+
+
+def init_common_async_db(db_path: str = None):
     """
-    global _app_engine, _app_session_maker
+    Initialize async (aiosqlite) connection to common-club.db database.
     
-    if db_path is None:
-        db_path = os.getenv("APP_DB_PATH")
-        if not db_path:
-            raise ValueError(
-                "APP_DB_PATH environment variable must be set. "
-                "Example: APP_DB_PATH=./coin-club.db"
-            )
+    Args:
+        db_path: Path to common-club.db file.
+                 Defaults to ../common-club/common-club.db or from env COMMON_DB_PATH
     
-    _app_engine = create_database_engine(db_path)
-    _app_session_maker = create_session_maker(_app_engine)
+    Calling it again with the same path returns the existing engine.
+    """
+    return _init_engine(
+        _resolve_common_db_path(db_path),
+        create_async_database_engine,
+        create_async_session_maker,
+        _common_async,
+    )
+
+
+def init_app_async_db(db_path: str = None):
+    """
+    Initialize async (aiosqlite) connection to app-specific database.
     
-    return _app_engine
+    Args:
+        db_path: Path to app database file.
+                 Defaults to from env APP_DB_PATH
+    
+    Calling it again with the same path returns the existing engine.
+    """
+    return _init_engine(
+        _resolve_app_db_path(db_path),
+        create_async_database_engine,
+        create_async_session_maker,
+        _app_async,
+    )
 
 
 def get_common_db() -> Generator:
@@ -78,12 +169,7 @@ def get_common_db() -> Generator:
         >>> async def get_users(db = Depends(get_common_db)):
         >>>     return db.query(User).all()
     """
-    global _common_session_maker
-    
-    if _common_session_maker is None:
-        init_common_db()
-    
-    return get_database_session(_common_session_maker)
+    yield from get_database_session(_ensure_initialized(_common, init_common_db).session_maker)
 
 
 def get_app_db() -> Generator:
@@ -104,25 +190,68 @@ def get_app_db() -> Generator:
         >>> async def get_transactions(db = Depends(get_app_db)):
         >>>     return db.query(Transaction).all()
     """
-    global _app_session_maker
+    yield from get_database_session(_ensure_initialized(_app, init_app_db).session_maker)
+
+
+@contextmanager
+def common_db_session() -> Generator:
+    """
+    Context manager for a common-club.db session outside FastAPI.
     
-    if _app_session_maker is None:
-        init_app_db()
+    Example:
+        >>> with common_db_session() as db:
+        >>>     users = db.query(User).all()
+    """
+    yield from get_common_db()
+
+
+@contextmanager
+def app_db_session() -> Generator:
+    """Context manager for an app database session outside FastAPI."""
+    yield from get_app_db()
+
+
+async def get_common_async_db() -> AsyncGenerator:
+    """
+    Get async database session for common-club.db.
+    
+    Unlike get_common_db(), this dependency runs on the event loop rather
+    than in FastAPI's threadpool. Requires the ``async`` extra.
+    
+    Yields:
+        AsyncSession for common-club.db
+    
+    Example:
+        >>> from sqlalchemy import select
+        >>> 
+        >>> @router.get("/users")
+        >>> async def get_users(db = Depends(get_common_async_db)):
+        >>>     return (await db.execute(select(User))).scalars().all()
+    """
+    session_maker = _ensure_initialized(_common_async, init_common_async_db).session_maker
+    async for db in get_async_database_session(session_maker):
+        yield db
+
+
+async def get_app_async_db() -> AsyncGenerator:
+    """
+    Get async database session for app-specific database.
+    
+    Requires the ``async`` extra.
     
-    return get_database_session(_app_session_maker)
+    Yields:
+        AsyncSession for app database
+    """
+    session_maker = _ensure_initialized(_app_async, init_app_async_db).session_maker
+    async for db in get_async_database_session(session_maker):
+        yield db
 
 
 def get_common_engine():
     """Get the common database engine (for migrations, etc.)."""
-    global _common_engine
-    if _common_engine is None:
-        init_common_db()
-    return _common_engine
+    return _ensure_initialized(_common, init_common_db).engine
 
 
 def get_app_engine():
     """Get the app database engine (for migrations, etc.)."""
-    global _app_engine
-    if _app_engine is None:
-        init_app_db()
-    return _app_engine
+    return _ensure_initialized(_app, init_app_db).engine
@@ -4,7 +4,7 @@ Category Model
 Database model for categories shared across club applications.
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.sql import func
 from ..database.base import Base
 
@@ -20,6 +20,11 @@ class Category(Base):
     Categories can be scoped to specific apps or available to all apps.
     """
     __tablename__ = "categories"
+    __table_args__ = (
+        # Predefined categories filtered by app, and a user's categories by type
+        Index("ix_categories_predefined_app_scope", "is_predefined", "app_scope"),
+        Index("ix_categories_user_type", "user_id", "type"),
+    )
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String, nullable=False)
@@ -0,0 +1,38 @@
+"""
+Schemas Module
+
+Provides Pydantic schemas for request validation and API responses.
+"""
+
+from ..utils.lazy import lazy_exports
+
+# Imported on first access (PEP 562)
+_LAZY_IMPORTS = {
+    "UserBase": ".user",
+    "UserCreate": ".user",
+    "UserLogin": ".user",
+    "UserResponse": ".user",
+    "UserUpdate": ".user",
+    "TokenResponse": ".user",
+    "CategoryBase": ".category",
+    "CategoryCreate": ".category",
+    "CategoryUpdate": ".category",
+    "CategoryResponse": ".category",
+    "CategoryListResponse": ".category",
+}
+
+__all__ = [
+    "UserBase",
+    "UserCreate",
+    "UserLogin",
+    "UserResponse",
+    "UserUpdate",
+    "TokenResponse",
+    "CategoryBase",
+    "CategoryCreate",
+    "CategoryUpdate",
+    "CategoryResponse",
+    "CategoryListResponse",
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS)
@@ -4,7 +4,7 @@ Category Schemas
 Pydantic schemas for category creation and responses.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
 
@@ -38,8 +38,7 @@ class CategoryResponse(CategoryBase):
     user_id: Optional[int] = None
     created_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CategoryListResponse(BaseModel):
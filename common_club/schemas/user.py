@@ -4,7 +4,7 @@ User Schemas
 Pydantic schemas for user registration, login, and responses.
 """
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from typing import Optional
 from datetime import datetime
 
@@ -32,8 +32,7 @@ class UserResponse(UserBase):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True  # Allows compatibility with SQLAlchemy models
+    model_config = ConfigDict(from_attributes=True)  # Allows compatibility with SQLAlchemy models
 
 
 class UserUpdate(BaseModel):
@@ -0,0 +1,51 @@
+"""
+Lazy Re-exports
+
+PEP 562 module ``__getattr__``/``__dir__`` used by the package ``__init__``
+modules, so their public names and submodules are only imported on first
+access.
+"""
+
+import importlib
+import sys
+
+
+def lazy_exports(package_name: str, lazy_imports: dict):
+    """
+    Build the ``__getattr__`` and ``__dir__`` pair for a package.
+    
+    Args:
+        package_name: The package's ``__name__``
+        lazy_imports: Maps each public name to the (relative) module defining it
+    
+    Returns:
+        ``(__getattr__, __dir__)`` to assign at the package's module level
+    
+    Example:
+        >>> __getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS)
+    """
+    namespace = vars(sys.modules[package_name])
+    
+    def __getattr__(name):
+        module_name = lazy_imports.get(name)
+        if module_name is not None:
+            value = getattr(importlib.import_module(module_name, package_name), name)
+            # Cache on the package so later lookups skip __getattr__
+            namespace[name] = value
+            return value
+        
+        # Submodules (e.g. ``common_club.auth``) resolve as attributes too;
+        # importing one binds it on the package
+        if not name.startswith("__"):
+            try:
+                return importlib.import_module(f".{name}", package_name)
+            except ModuleNotFoundError as e:
+                if e.name != f"{package_name}.{name}":
+                    raise
+        
+        raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+    
+    def __dir__():
+        return sorted(set(namespace) | set(lazy_imports))
+    
+    return __getattr__, __dir__
@@ -0,0 +1,43 @@
+"""
+Pytest configuration for the common-club test suite.
+"""
+
+import os
+
+import pytest
+
+from testing_constants import TEST_PASSWORD
+
+# Bump the suffix whenever the password hashing scheme changes
+TEST_PASSWORD_CACHE_KEY = "common_club/testpw_hash_v1"
+
+
+def pytest_configure(config):
+    """Configure the environment before any common_club module is imported."""
+    # Test hashes don't need the production bcrypt work factor
+    os.environ.setdefault("COMMON_CLUB_BCRYPT_ROUNDS", "4")
+
+
+@pytest.fixture(scope="session")
+def hashed_test_password(request):
+    """
+    Bcrypt hash of TEST_PASSWORD, reused across pytest runs.
+    
+    The hash is stored in the pytest cache, so only the first run pays for
+    bcrypt; ``pytest --cache-clear`` forces a fresh one. Without the cache
+    plugin (``-p no:cacheprovider``) it is hashed on every run.
+    """
+    cache = getattr(request.config, "cache", None)
+    cached = cache.get(TEST_PASSWORD_CACHE_KEY, None) if cache is not None else None
+    if cached:
+        return cached
+    
+    from common_club.auth import hash_password, verify_password
+    
+    password_hash = hash_password(TEST_PASSWORD)
+    # Only on a cache miss, so cached runs still skip bcrypt entirely
+    assert verify_password(TEST_PASSWORD, password_hash), "Fresh hash does not verify"
+    
+    if cache is not None:
+        cache.set(TEST_PASSWORD_CACHE_KEY, password_hash)
+    return password_hash
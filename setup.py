@@ -12,15 +12,24 @@ setup(
         "sqlalchemy>=2.0.0",
         "pydantic>=2.0.0",
         "pydantic[email]>=2.0.0",  # For EmailStr support
-        "python-jose[cryptography]>=3.3.0",
+        "PyJWT>=2.8.0",
+        "cachetools>=5.0.0",
         "passlib[bcrypt]>=1.7.4",
         "python-multipart>=0.0.6",
         "email-validator>=2.0.0",  # Required for EmailStr
     ],
     extras_require={
+        "async": [
+            "aiosqlite>=0.19.0",
+        ],
+        "orjson": [
+            "orjson>=3.9.0",  # For ORJSONResponse on older FastAPI
+        ],
         "dev": [
             "pytest>=7.4.0",
             "pytest-asyncio>=0.21.0",
+            "pytest-xdist>=3.3.0",
+            "aiosqlite>=0.19.0",  # For the async engine tests
             "black>=23.0.0",
             "flake8>=6.0.0",
             "mypy>=1.5.0",
@@ -1,211 +1,744 @@
 #!/usr/bin/env python3
 """
-Test script for common-club package
+Test suite for common-club package
 
 Verifies that the package is set up correctly by:
 1. Creating database and tables
 2. Seeding predefined categories
 3. Creating a test user
 4. Testing authentication
+
+Run with pytest (``pytest -n auto test_package.py`` to use all cores)
+or directly as a script (``python test_package.py``).
 """
 
+import asyncio
 import os
+import subprocess
 import sys
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+
+import pytest
+
+from testing_constants import TEST_EMAIL, TEST_NAME, TEST_PASSWORD
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# (app_scope, minimum number of predefined categories) checked by test_categories
+CATEGORY_SCOPES = [("coin", 1), ("all", 1)]
+
+# (Authorization header, expected status) checked by test_bearer_token;
+# {token} is replaced by a valid access token
+BEARER_CASES = [
+    (None, 401),               # missing header
+    ("Basic {token}", 401),    # non-Bearer scheme
+    ("Bearer ", 401),          # empty token
+    ("bearer {token}", 200),   # scheme is case-insensitive
+    ("Bearer {token}", 200),
+]
+
+# Composite category indexes that existing databases must gain on upgrade
+CATEGORY_INDEXES = ("ix_categories_predefined_app_scope", "ix_categories_user_type")
+
+# Durability is irrelevant for the throwaway test database, so skip fsyncs
+TEST_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+)
+
+
+def _test_db_path(worker_id="main"):
+    """Named shared-cache in-memory database, so no test touches the disk."""
+    return f"file:common_club_test_{worker_id}?mode=memory&cache=shared&uri=true"
+
+
+def _set_test_pragmas(dbapi_connection, connection_record):
+    """Apply TEST_SQLITE_PRAGMAS after the library's own connect PRAGMAs."""
+    cursor = dbapi_connection.cursor()
+    for pragma in TEST_SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    """Stop pysqlite from opening transactions implicitly; see _use_savepoints."""
+    dbapi_connection.isolation_level = None
+
+
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+def _use_savepoints(engine):
+    """
+    Make SAVEPOINTs nest inside a real outer transaction on the test engine.
+    
+    pysqlite never emits BEGIN before a SAVEPOINT, so RELEASE would commit
+    and the outer rollback would undo nothing. This is SQLAlchemy's
+    documented pysqlite recipe; it stays test-only because explicit BEGIN
+    holds a read transaction for each session's lifetime.
+    """
+    from sqlalchemy import event
+    
+    event.listen(engine, "connect", _disable_pysqlite_transactions)
+    event.listen(engine, "begin", _emit_begin)
+
+
+def _init_test_database(db_path):
+    """
+    Create and seed a test database, returning its engine.
+    
+    An in-memory database is dropped once its last connection closes, so
+    the caller must keep the returned engine alive for the whole run.
+    """
+    from common_club.database import init_common_db
+    from common_club.database.init_db import initialize_database
+    
+    from sqlalchemy import event
+    
+    # Listeners go on before the first connection is opened; the engine is
+    # reused by initialize_database for the same path
+    engine = init_common_db(db_path)
+    event.listen(engine, "connect", _set_test_pragmas)
+    _use_savepoints(engine)
+    
+    initialize_database(db_path, seed_data=True)
+    return engine
+
+
+@contextmanager
+def _outer_transaction(engine):
+    """
+    Hold one connection and transaction open for the whole run.
+    
+    Everything the tests write is discarded by the final rollback, so the
+    suite never commits to the database.
+    """
+    with engine.connect() as connection:
+        outer = connection.begin()
+        try:
+            yield connection
+        finally:
+            outer.rollback()
+
+
+def _join_session(connection):
+    """Session bound to the outer transaction; its commits only release a SAVEPOINT."""
+    from sqlalchemy.orm import Session
+    
+    return Session(bind=connection, join_transaction_mode="create_savepoint")
+
+
+@contextmanager
+def _savepoint_session(connection):
+    """Session for a single test, rolled back to its SAVEPOINT afterwards."""
+    savepoint = connection.begin_nested()
+    session = _join_session(connection)
+    try:
+        yield session
+    finally:
+        session.close()
+        savepoint.rollback()
+
+
+def _create_test_user(connection, password_hash):
+    """Insert the test user inside the outer transaction and return its ID."""
+    from sqlalchemy import insert
+    from common_club.models import User
+    
+    with _join_session(connection) as db:
+        # INSERT ... RETURNING hands back the ID in the same statement
+        user_id = db.execute(
+            insert(User).values(
+                email=TEST_EMAIL,
+                password_hash=password_hash,
+                name=TEST_NAME
+            ).returning(User.id)
+        ).scalar_one()
+        db.commit()
+        return user_id
+
+
+@pytest.fixture(scope="session")
+def db_path():
+    """Seeded test database; each xdist worker gets its own in-memory database."""
+    db_path = _test_db_path(os.environ.get("PYTEST_XDIST_WORKER", "main"))
+    
+    engine = _init_test_database(db_path)
+    yield db_path
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def connection(db_path):
+    """Connection whose outer transaction spans the whole session."""
+    from common_club.database import get_common_engine
+    
+    with _outer_transaction(get_common_engine()) as connection:
+        yield connection
+
+
+@pytest.fixture(scope="session")
+def user_id(connection, hashed_test_password):
+    """ID of the test user created in the outer transaction."""
+    return _create_test_user(connection, hashed_test_password)
+
+
+@pytest.fixture
+def db(connection):
+    """Per-test session, rolled back to a SAVEPOINT when the test ends."""
+    with _savepoint_session(connection) as session:
+        yield session
+
+
+def _auth_test_client(db=None):
+    """TestClient for a small app using the auth dependencies, with db as get_common_db."""
+    from fastapi import Depends, FastAPI
+    from fastapi.testclient import TestClient
+    from common_club.auth import get_current_user, get_current_user_email, get_current_user_id
+    from common_club.database import get_common_db
+    
+    app = FastAPI()
+    
+    @app.get("/user-id")
+    def read_user_id(user_id: int = Depends(get_current_user_id)):
+        return {"user_id": user_id}
+    
+    @app.get("/identity")
+    def read_identity(
+        user_id: int = Depends(get_current_user_id),
+        email: str = Depends(get_current_user_email),
+    ):
+        return {"user_id": user_id, "email": email}
+    
+    @app.get("/me")
+    def read_me(user=Depends(get_current_user)):
+        return {"id": user.id, "email": user.email}
+    
+    # Serve the test's own session instead of opening one on the shared engine
+    app.dependency_overrides[get_common_db] = lambda: db
+    return TestClient(app)
+
+
 def test_imports():
     """Test that all modules can be imported."""
     logger.info("Testing imports...")
     
-    try:
-        from common_club import create_access_token, verify_token, get_current_user_id
-        from common_club.auth import hash_password, verify_password
-        from common_club.database import get_common_db, get_app_db, init_common_db
-        from common_club.models import User, SharedCategory, AppSettings
-        from common_club.schemas.user import UserCreate, UserLogin, UserResponse
-        from common_club.schemas.category import CategoryCreate, CategoryResponse
-        logger.info("✅ All imports successful")
-        return True
-    except Exception as e:
-        logger.error(f"❌ Import failed: {e}")
-        return False
+    # Token helpers must stay cheap to import: measure in a fresh interpreter,
+    # since this process may already have loaded everything
+    probe = (
+        "import sys, time\n"
+        "t = time.perf_counter()\n"
+        "from common_club import create_access_token\n"
+        "print(time.perf_counter() - t)\n"
+        "print(' '.join(m for m in ('sqlalchemy', 'fastapi', 'passlib') if m in sys.modules))\n"
+        # Submodules stay reachable as attributes of the lazy packages
+        "import common_club\n"
+        "print(common_club.auth.__name__, common_club.database.init_db.__name__,\n"
+        "      hasattr(common_club, 'no_such_module'))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True,
+    )
+    elapsed, heavy_modules, submodules = (result.stdout.splitlines() + [""])[:3]
+    assert float(elapsed) < 0.5, f"common_club import took {float(elapsed):.3f}s"
+    assert heavy_modules == "", f"common_club import eagerly loaded: {heavy_modules}"
+    assert submodules == "common_club.auth common_club.database.init_db False", submodules
+    
+    from common_club import create_access_token, verify_token, get_current_user_id
+    from common_club.auth import hash_password, verify_password
+    from common_club.database import get_common_db, get_app_db, init_common_db
+    from common_club.models import User, SharedCategory, AppSettings
+    from common_club.schemas.user import UserCreate, UserLogin, UserResponse
+    from common_club.schemas.category import CategoryCreate, CategoryResponse
+    
+    logger.info("✅ All imports successful")
 
 
-def test_database_init():
+def test_database_init(db_path, db):
     """Test database initialization."""
     logger.info("Testing database initialization...")
     
+    from sqlalchemy import select, func, inspect, text
+    from common_club.database import init_common_db
+    from common_club.database.init_db import PREDEFINED_CATEGORIES
+    from common_club.models import SharedCategory
+    
+    engine = init_common_db(db_path)
+    assert init_common_db(db_path) is engine, "Engine re-created for the same path"
+    
+    # Verify tables were created; inspect the test's own connection, since a
+    # fresh engine checkout would share (and reset) the single memory connection
+    tables = set(inspect(db.connection()).get_table_names())
+    assert {"users", "categories", "app_settings"} <= tables, "Tables not created"
+    
+    # Verify the bulk seed inserted every predefined category
+    seeded = db.execute(
+        select(func.count()).where(SharedCategory.is_predefined.is_(True))
+    ).scalar()
+    assert seeded == len(PREDEFINED_CATEGORIES)
+    assert db.execute(text("PRAGMA synchronous")).scalar() == 0  # OFF
+    
+    logger.info("✅ Database initialization successful")
+
+
+def test_schema_upgrade():
+    """Test that create_tables adds missing indexes to an existing database."""
+    logger.info("Testing schema upgrade...")
+    
+    from sqlalchemy import inspect
+    from common_club.database.base import create_database_engine
+    from common_club.database.init_db import create_tables
+    
+    # A private database, so dropping indexes can't affect the other tests
+    engine = create_database_engine(":memory:")
     try:
-        from common_club.database.init_db import initialize_database
-        
-        # Initialize with test database
-        test_db_path = "./test-common-club.db"
-        if os.path.exists(test_db_path):
-            os.remove(test_db_path)
+        create_tables(engine)
         
-        initialize_database(test_db_path, seed_data=True)
+        # Simulate a database stamped before the category indexes existed
+        with engine.begin() as conn:
+            for name in CATEGORY_INDEXES:
+                conn.exec_driver_sql(f"DROP INDEX {name}")
+            conn.exec_driver_sql("PRAGMA user_version = 1")
         
-        # Verify database file was created
-        assert os.path.exists(test_db_path), "Database file not created"
+        create_tables(engine)
         
-        logger.info("✅ Database initialization successful")
-        return True, test_db_path
-    except Exception as e:
-        logger.error(f"❌ Database initialization failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False, None
+        indexes = {index["name"] for index in inspect(engine).get_indexes("categories")}
+        assert set(CATEGORY_INDEXES) <= indexes, f"Missing indexes: {indexes}"
+    finally:
+        engine.dispose()
+    
+    logger.info("✅ Schema upgrade successful")
 
 
-def test_user_creation(db_path):
-    """Test creating a user."""
-    logger.info("Testing user creation...")
+async def _check_async_database(db_path):
+    """Body of test_async_database, run on its own event loop."""
+    from sqlalchemy import func, insert, select
+    from common_club.database import get_common_async_db, init_common_async_db
+    from common_club.database.base import Base
+    from common_club.models import User
+    
+    engine = init_common_async_db(db_path)
+    assert init_common_async_db(db_path) is engine, "Async engine re-created for the same path"
     
     try:
-        from common_club.auth import hash_password
-        from common_club.models import User
-        from common_club.database import init_common_db, get_common_db
-        
-        # Initialize with test database
-        init_common_db(db_path)
-        db = next(get_common_db())
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
         
-        # Create test user
-        test_user = User(
-            email="test@example.com",
-            password_hash=hash_password("testpassword123"),
-            name="Test User"
-        )
-        db.add(test_user)
-        db.commit()
-        db.refresh(test_user)
+        count_users = select(func.count()).select_from(User)
+        new_user = insert(User).values(email=TEST_EMAIL, password_hash="x", name=TEST_NAME)
         
-        # Verify user was created
-        user = db.query(User).filter(User.email == "test@example.com").first()
-        assert user is not None, "User not found in database"
-        assert user.email == "test@example.com"
-        assert user.name == "Test User"
+        async for db in get_common_async_db():
+            await db.execute(new_user)
+            await db.rollback()
+            assert (await db.execute(count_users)).scalar() == 0, "Rolled-back insert was kept"
+            
+            await db.execute(new_user)
+            await db.commit()
         
-        logger.info(f"✅ User created successfully: {user}")
-        return True, user.id
-    except Exception as e:
-        logger.error(f"❌ User creation failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False, None
+        # A fresh session from the dependency sees the committed row
+        async for db in get_common_async_db():
+            assert (await db.execute(count_users)).scalar() == 1, "Committed insert was lost"
     finally:
-        db.close()
+        await engine.dispose()
+
+
+def test_async_database():
+    """Test the aiosqlite engine and get_common_async_db dependency."""
+    logger.info("Testing async database...")
+    
+    # A private database, so the async engine never shares the sync one's connection
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    asyncio.run(_check_async_database(_test_db_path(f"async_{worker_id}")))
+    
+    logger.info("✅ Async database test successful")
+
+
+def test_concurrent_sessions():
+    """Test that a session can write after another one commits behind its read."""
+    logger.info("Testing concurrent sessions...")
+    
+    import tempfile
+    from sqlalchemy import insert, select, update
+    from common_club.database.base import (
+        create_database_engine, create_session_maker, Base
+    )
+    from common_club.models import AppSettings
+    
+    # A WAL file database, where a read transaction left open by one session
+    # would make its later write fail with "database is locked"
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_database_engine(os.path.join(tmp_dir, "concurrent.db"))
+        try:
+            Base.metadata.create_all(engine)
+            session_maker = create_session_maker(engine)
+            value = AppSettings.value
+            
+            with session_maker() as db:
+                db.execute(insert(AppSettings).values(user_id=1, app_name="coin", key="k", value="9"))
+                db.commit()
+            
+            with session_maker() as db_a, session_maker() as db_b:
+                assert db_a.execute(select(value)).scalar() == "9"
+                
+                db_b.execute(update(AppSettings).values(value="10"))
+                db_b.commit()
+                
+                db_a.execute(update(AppSettings).values(value="11"))
+                db_a.commit()
+            
+            with session_maker() as db:
+                assert db.execute(select(value)).scalar() == "11"
+        finally:
+            engine.dispose()
+    
+    logger.info("✅ Concurrent sessions test successful")
+
+
+def test_user_creation(user_id, hashed_test_password, db):
+    """Test creating a user."""
+    logger.info("Testing user creation...")
+    
+    from sqlalchemy import select
+    from common_club.models import User
+    
+    # Verify user was created, fetching plain columns rather than a User
+    row = db.execute(
+        select(User.id, User.email, User.name, User.password_hash)
+        .where(User.email == TEST_EMAIL)
+    ).one_or_none()
+    assert row is not None, "User not found in database"
+    assert tuple(row) == (user_id, TEST_EMAIL, TEST_NAME, hashed_test_password)
+    
+    logger.info(f"✅ User created successfully: {tuple(row[:3])}")
 
 
 def test_authentication(user_id):
     """Test JWT token creation and verification."""
     logger.info("Testing authentication...")
     
+    from common_club.auth import create_access_token, verify_token
+    
+    # Create token
+    token = create_access_token(user_id=user_id, email=TEST_EMAIL)
+    logger.info(f"Token created: {token[:50]}...")
+    
+    # Verify token
+    payload = verify_token(token)
+    assert int(payload["sub"]) == user_id
+    assert payload["email"] == TEST_EMAIL
+    
+    # Second verification is served from the payload cache
+    assert verify_token(token) is payload
+    
+    logger.info("✅ Authentication test successful")
+
+
+def test_production_secret_guard():
+    """Test that production refuses to start with the default JWT secret."""
+    logger.info("Testing production secret guard...")
+    
+    probe = "import common_club.auth.jwt_handler"
+    env = {k: v for k, v in os.environ.items() if k != "JWT_SECRET_KEY"}
+    env["COMMON_CLUB_ENV"] = "production"
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    
+    result = subprocess.run(
+        [sys.executable, "-c", probe], cwd=cwd, env=env, capture_output=True, text=True
+    )
+    assert result.returncode != 0
+    assert "RuntimeError: JWT_SECRET_KEY" in result.stderr, result.stderr
+    
+    # A real secret satisfies the guard
+    env["JWT_SECRET_KEY"] = "not-the-default"
+    subprocess.run([sys.executable, "-c", probe], cwd=cwd, env=env, check=True)
+    
+    logger.info("✅ Production secret guard test successful")
+
+
+def test_token_expiry():
+    """Test that cached token payloads still expire."""
+    logger.info("Testing token expiry...")
+    
+    import time
+    from datetime import timedelta
+    from common_club.auth import create_access_token, verify_token
+    
+    # Two seconds, so the first check can't straddle the (whole-second) exp
+    token = create_access_token(user_id=1, email=TEST_EMAIL, expires_delta=timedelta(seconds=2))
+    payload = verify_token(token)
+    assert verify_token(token) is payload
+    
+    time.sleep(payload["exp"] - time.time() + 0.05)
+    with pytest.raises(ValueError, match="expired"):
+        verify_token(token)
+    
+    # A cached payload stripped of exp (the dict is shared) is rejected, not immortal
+    token = create_access_token(user_id=2, email=TEST_EMAIL)
+    del verify_token(token)["exp"]
+    with pytest.raises(ValueError, match="exp"):
+        verify_token(token)
+    
+    logger.info("✅ Token expiry test successful")
+
+
+def test_token_decoded_once():
+    """Test that a route reading both the user ID and email decodes the token once."""
+    logger.info("Testing per-request token decoding...")
+    
+    from unittest import mock
+    from common_club.auth import create_access_token, dependencies, jwt_handler
+    
+    client = _auth_test_client()
+    # A user ID no other test mints, so the token isn't already in the payload cache
+    token = create_access_token(user_id=3, email=TEST_EMAIL)
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    with mock.patch.object(dependencies, "verify_token", wraps=dependencies.verify_token) as verify, \
+            mock.patch.object(jwt_handler.jwt, "decode", wraps=jwt_handler.jwt.decode) as decode:
+        for _ in range(2):
+            response = client.get("/identity", headers=headers)
+            assert response.status_code == 200
+            assert response.json() == {"user_id": 3, "email": TEST_EMAIL}
+    
+    # Other threads may share the patched functions, so count this token's calls only
+    def calls_for_token(patched):
+        return sum(1 for call in patched.call_args_list if call.args[:1] == (token,))
+    
+    # Once per request for both dependencies, and one real decode overall
+    assert calls_for_token(verify) == 2
+    assert calls_for_token(decode) == 1
+    
+    logger.info("✅ Per-request token decoding test successful")
+
+
+def test_current_user(user_id, db):
+    """Test the cached get_current_user dependency."""
+    logger.info("Testing current user dependency...")
+    
+    from sqlalchemy import delete
+    from common_club.auth import create_access_token, invalidate_cached_user
+    from common_club.auth.dependencies import _user_cache
+    from common_club.models import User
+    
+    client = _auth_test_client(db)
+    token = create_access_token(user_id=user_id, email=TEST_EMAIL)
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    invalidate_cached_user(user_id)
     try:
-        from common_club.auth import create_access_token, verify_token
+        # Cache miss: loaded from the database, then cached
+        response = client.get("/me", headers=headers)
+        assert response.status_code == 200
+        assert response.json() == {"id": user_id, "email": TEST_EMAIL}
+        assert user_id in _user_cache
         
-        # Create token
-        token = create_access_token(user_id=user_id, email="test@example.com")
-        logger.info(f"Token created: {token[:50]}...")
+        # Cache hit: still served once the row is gone (restored by the SAVEPOINT rollback)
+        db.execute(delete(User).where(User.id == user_id))
+        assert client.get("/me", headers=headers).status_code == 200
         
-        # Verify token
-        payload = verify_token(token)
-        assert int(payload["sub"]) == user_id
-        assert payload["email"] == "test@example.com"
-        
-        logger.info("✅ Authentication test successful")
+        # After invalidation the user is reloaded, and a missing user is rejected
+        invalidate_cached_user(user_id)
+        response = client.get("/me", headers=headers)
+        assert response.status_code == 401
+        assert response.json()["detail"] == "User not found"
+    finally:
+        invalidate_cached_user(user_id)
+    
+    logger.info("✅ Current user test successful")
+
+
+@pytest.mark.parametrize("header,expected_status", BEARER_CASES)
+def test_bearer_token(header, expected_status):
+    """Test Authorization header parsing in the auth dependencies."""
+    logger.info(f"Testing Authorization header {header!r}...")
+    
+    from common_club.auth import create_access_token
+    
+    client = _auth_test_client()
+    headers = {}
+    if header is not None:
+        headers["Authorization"] = header.format(token=create_access_token(user_id=1, email=TEST_EMAIL))
+    
+    response = client.get("/user-id", headers=headers)
+    assert response.status_code == expected_status, response.json()
+    if expected_status == 200:
+        assert response.json() == {"user_id": 1}
+    
+    logger.info("✅ Bearer token test successful")
+
+
+def test_openapi_security():
+    """Test that routes using the auth dependencies declare the Bearer scheme."""
+    logger.info("Testing OpenAPI security scheme...")
+    
+    schema = _auth_test_client().app.openapi()
+    
+    assert schema["components"]["securitySchemes"] == {
+        "HTTPBearer": {"type": "http", "scheme": "bearer"}
+    }
+    for path in ("/user-id", "/me"):
+        assert schema["paths"][path]["get"]["security"] == [{"HTTPBearer": []}]
+    
+    logger.info("✅ OpenAPI security test successful")
+
+
+@pytest.mark.parametrize("scope,min_count", CATEGORY_SCOPES)
+def test_categories(scope, min_count, db):
+    """Test predefined categories for an app scope."""
+    logger.info(f"Testing {scope} categories...")
+    
+    from sqlalchemy import select, func
+    from common_club.models import SharedCategory
+    
+    # Count predefined categories per scope in SQL, without loading rows
+    counts = dict(db.execute(
+        select(SharedCategory.app_scope, func.count())
+        .where(SharedCategory.is_predefined.is_(True))
+        .group_by(SharedCategory.app_scope)
+    ).all())
+    
+    logger.info(f"Found {sum(counts.values())} predefined categories")
+    logger.info(f"  - {counts.get(scope, 0)} {scope} categories")
+    
+    assert counts.get(scope, 0) >= min_count, f"No predefined {scope} categories found"
+    
+    logger.info("✅ Categories test successful")
+
+
+# main() runs tests on worker threads, but they share one connection whose
+# SAVEPOINTs must not interleave, so database work is serialized on this lock
+_connection_lock = threading.Lock()
+
+
+def _run(test_name, test, *args, connection=None):
+    """
+    Run a test outside pytest, logging failures instead of raising.
+    
+    With a connection, the test also gets a session inside its own SAVEPOINT
+    as its last argument, mirroring the ``db`` fixture.
+    """
+    try:
+        if connection is None:
+            test(*args)
+        else:
+            with _connection_lock, _savepoint_session(connection) as db:
+                test(*args, db)
         return True
     except Exception as e:
-        logger.error(f"❌ Authentication test failed: {e}")
+        logger.exception(f"❌ {test_name} failed: {e}")
         return False
 
 
-def test_categories(db_path):
-    """Test predefined categories."""
-    logger.info("Testing categories...")
+def _run_user_creation(connection, user_id):
+    """Create and check the test user, resolving the user_id future either way."""
+    from common_club.auth import hash_password
     
     try:
-        from common_club.models import SharedCategory
-        from common_club.database import init_common_db, get_common_db
-        
-        init_common_db(db_path)
-        db = next(get_common_db())
-        
-        # Count predefined categories
-        predefined = db.query(SharedCategory).filter(
-            SharedCategory.is_predefined == True
-        ).all()
-        
-        logger.info(f"Found {len(predefined)} predefined categories")
-        
-        # Show some examples
-        coin_categories = [c for c in predefined if c.app_scope == "coin"]
-        all_categories = [c for c in predefined if c.app_scope == "all"]
-        
-        logger.info(f"  - {len(coin_categories)} coin-specific categories")
-        logger.info(f"  - {len(all_categories)} cross-app categories")
-        
-        # Show first 5 categories
-        logger.info("Sample categories:")
-        for cat in predefined[:5]:
-            logger.info(f"  - {cat.name} ({cat.type}, {cat.app_scope})")
-        
-        assert len(predefined) > 0, "No predefined categories found"
-        
-        logger.info("✅ Categories test successful")
-        return True
+        # Hashed outside the lock: bcrypt releases the GIL
+        password_hash = hash_password(TEST_PASSWORD)
+        with _connection_lock:
+            created_id = _create_test_user(connection, password_hash)
     except Exception as e:
-        logger.error(f"❌ Categories test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ User creation failed: {e}")
+        user_id.set_result(None)
         return False
-    finally:
-        db.close()
+    
+    success = _run(
+        "User Creation", test_user_creation, created_id, password_hash, connection=connection
+    )
+    user_id.set_result(created_id if success else None)
+    return success
+
+
+def _run_with_user(test_name, test, user_id, connection=None):
+    """Run a test taking the test user's ID once it exists; None means skipped."""
+    if user_id.result() is None:
+        return None
+    return _run(test_name, test, user_id.result(), connection=connection)
 
 
 def main():
-    """Run all tests."""
+    """Run all tests without pytest, overlapping the independent ones on threads."""
+    # Must be set before common_club.auth.password is imported
+    os.environ.setdefault("COMMON_CLUB_BCRYPT_ROUNDS", "4")
+    
     logger.info("="*60)
     logger.info("Common Club Package Test Suite")
     logger.info("="*60)
     
-    results = []
-    
-    # Test 1: Imports
-    results.append(("Imports", test_imports()))
-    
-    # Test 2: Database Init
-    success, db_path = test_database_init()
-    results.append(("Database Init", success))
+    db_path = _test_db_path()
     
-    if not success:
+    try:
+        # Keeps the in-memory database alive until main() returns
+        engine = _init_test_database(db_path)
+    except Exception as e:
+        logger.exception(f"❌ Database initialization failed: {e}")
         logger.error("Cannot continue without database")
         return False
     
-    # Test 3: User Creation
-    success, user_id = test_user_creation(db_path)
-    results.append(("User Creation", success))
-    
-    if success and user_id:
-        # Test 4: Authentication
-        results.append(("Authentication", test_authentication(user_id)))
+    # All database tests share one outer transaction that is rolled back at the end
+    with _outer_transaction(engine) as connection:
+        # Tests needing the test user depend on user creation: they wait on this future
+        user_id = Future()
+        
+        tests = {
+            "Imports": partial(_run, "Imports", test_imports),
+            "Database Init": partial(
+                _run, "Database Init", test_database_init, db_path, connection=connection
+            ),
+            "Schema Upgrade": partial(_run, "Schema Upgrade", test_schema_upgrade),
+            "Async Database": partial(_run, "Async Database", test_async_database),
+            "Concurrent Sessions": partial(_run, "Concurrent Sessions", test_concurrent_sessions),
+            "User Creation": partial(_run_user_creation, connection, user_id),
+            "Authentication": partial(
+                _run_with_user, "Authentication", test_authentication, user_id
+            ),
+            "Production Secret": partial(_run, "Production Secret", test_production_secret_guard),
+            "Token Expiry": partial(_run, "Token Expiry", test_token_expiry),
+            "Token Decoded Once": partial(_run, "Token Decoded Once", test_token_decoded_once),
+            "Current User": partial(
+                _run_with_user, "Current User", test_current_user, user_id, connection=connection
+            ),
+        }
+        tests["OpenAPI Security"] = partial(_run, "OpenAPI Security", test_openapi_security)
+        for header, expected_status in BEARER_CASES:
+            test_name = f"Bearer Token ({header!r})"
+            tests[test_name] = partial(_run, test_name, test_bearer_token, header, expected_status)
+        for scope, min_count in CATEGORY_SCOPES:
+            test_name = f"Categories ({scope})"
+            tests[test_name] = partial(
+                _run, test_name, test_categories, scope, min_count, connection=connection
+            )
+        
+        # Submitted in dict order, so user creation is always picked up before
+        # the tests that block a worker waiting for it
+        with ThreadPoolExecutor(max_workers=min(8, len(tests))) as executor:
+            futures = {name: executor.submit(test) for name, test in tests.items()}
+            results = {name: future.result() for name, future in futures.items()}
     
-    # Test 5: Categories
-    results.append(("Categories", test_categories(db_path)))
+    # Skipped tests (None) are left out of the summary
+    results = {name: result for name, result in results.items() if result is not None}
     
     # Summary
     logger.info("="*60)
     logger.info("Test Results Summary:")
     logger.info("="*60)
-    for test_name, result in results:
+    for test_name, result in results.items():
         status = "✅ PASS" if result else "❌ FAIL"
         logger.info(f"{test_name}: {status}")
     
-    all_passed = all(result for _, result in results)
+    all_passed = all(results.values())
     
     if all_passed:
         logger.info("="*60)
@@ -216,10 +749,8 @@ def main():
         logger.error("❌ Some tests failed. Please check the errors above.")
         logger.error("="*60)
     
-    # Cleanup
-    if db_path and os.path.exists(db_path):
-        os.remove(db_path)
-        logger.info(f"Cleaned up test database: {db_path}")
+    # Cleanup: the in-memory database goes away with its last connection
+    engine.dispose()
     
     return all_passed
 
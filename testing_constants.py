@@ -0,0 +1,11 @@
+"""
+Constants shared by conftest.py and test_package.py.
+
+Kept in a plain module (on sys.path via pytest.ini's ``pythonpath``), since
+importing conftest.py as a regular module breaks under
+``--import-mode=importlib``.
+"""
+
+TEST_EMAIL = "test@example.com"
+TEST_NAME = "Test User"
+TEST_PASSWORD = "testpassword123"